@@ -0,0 +1,184 @@
+"""
+Barnes-Hut octree force evaluator for many-body systems.
+
+Direct summation is O(N^2) per step; for large body counts (asteroid belts,
+test clusters) the octree approximates far-field contributions with each
+cell's center of mass, bringing force evaluation down to O(N log N). The
+tree is array-backed — node ids index flat ``children``/``com``/``mass``
+arrays rather than Python objects — so the whole build/traverse runs inside
+a compiled Numba kernel with good cache locality.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numba import njit
+
+THETA_DEFAULT = 0.5  # Opening angle: cell width / distance below this uses the pseudo-particle
+_MIN_CELL_HALF_WIDTH = 1e-12  # Stop subdividing once cells degenerate (duplicate positions)
+
+
+@njit(cache=True, fastmath=True)
+def _octant(center_x, center_y, center_z, x, y, z):
+    octant = 0
+    if x >= center_x:
+        octant += 1
+    if y >= center_y:
+        octant += 2
+    if z >= center_z:
+        octant += 4
+    return octant
+
+
+@njit(cache=True, fastmath=True)
+def compute_forces_bh(
+    positions: np.ndarray,
+    masses: np.ndarray,
+    gravitational_constant: float,
+    theta: float,
+) -> np.ndarray:
+    """
+    Return a forces[N, 3] array matching the direct kernel's output shape.
+
+    Builds the octree by descending/subdividing per body, accumulating each
+    node's mass and weighted center of mass on the way down, then evaluates
+    forces by traversing with the opening-angle criterion.
+    """
+    n = positions.shape[0]
+    forces = np.zeros((n, 3))
+    if n < 2:
+        return forces
+
+    capacity = 64 * n + 64
+    children = np.full((capacity, 8), -1, np.int64)
+    node_body = np.full(capacity, -1, np.int64)
+    node_count = np.zeros(capacity, np.int64)
+    node_mass = np.zeros(capacity)
+    weighted_com = np.zeros((capacity, 3))
+    center = np.zeros((capacity, 3))
+    half_width = np.zeros(capacity)
+
+    # Root cube bounding all bodies.
+    lo = positions[0].copy()
+    hi = positions[0].copy()
+    for i in range(n):
+        for axis in range(3):
+            if positions[i, axis] < lo[axis]:
+                lo[axis] = positions[i, axis]
+            if positions[i, axis] > hi[axis]:
+                hi[axis] = positions[i, axis]
+    root_half = 0.0
+    for axis in range(3):
+        center[0, axis] = 0.5 * (lo[axis] + hi[axis])
+        extent = 0.5 * (hi[axis] - lo[axis])
+        if extent > root_half:
+            root_half = extent
+    half_width[0] = root_half * 1.001 + 1e-9
+    next_node = 1
+
+    # Build: insert bodies one at a time.
+    for i in range(n):
+        node = 0
+        while True:
+            if node_count[node] == 0:
+                node_body[node] = i
+                node_count[node] = 1
+                node_mass[node] = masses[i]
+                for axis in range(3):
+                    weighted_com[node, axis] = masses[i] * positions[i, axis]
+                break
+
+            degenerate = (
+                half_width[node] < _MIN_CELL_HALF_WIDTH or next_node + 8 > capacity
+            )
+            if node_body[node] != -1 and not degenerate:
+                # Single-body leaf: push the resident body down one level.
+                old = node_body[node]
+                node_body[node] = -1
+                octant = _octant(
+                    center[node, 0], center[node, 1], center[node, 2],
+                    positions[old, 0], positions[old, 1], positions[old, 2],
+                )
+                child = next_node
+                next_node += 1
+                children[node, octant] = child
+                quarter = 0.5 * half_width[node]
+                half_width[child] = quarter
+                for axis in range(3):
+                    shift = quarter if positions[old, axis] >= center[node, axis] else -quarter
+                    center[child, axis] = center[node, axis] + shift
+                node_body[child] = old
+                node_count[child] = 1
+                node_mass[child] = masses[old]
+                for axis in range(3):
+                    weighted_com[child, axis] = masses[old] * positions[old, axis]
+
+            node_count[node] += 1
+            node_mass[node] += masses[i]
+            for axis in range(3):
+                weighted_com[node, axis] += masses[i] * positions[i, axis]
+
+            if degenerate:
+                # Duplicate-position cluster: fold into the node's aggregate
+                # mass instead of subdividing forever.
+                break
+
+            octant = _octant(
+                center[node, 0], center[node, 1], center[node, 2],
+                positions[i, 0], positions[i, 1], positions[i, 2],
+            )
+            child = children[node, octant]
+            if child == -1:
+                child = next_node
+                next_node += 1
+                children[node, octant] = child
+                quarter = 0.5 * half_width[node]
+                half_width[child] = quarter
+                for axis in range(3):
+                    shift = quarter if positions[i, axis] >= center[node, axis] else -quarter
+                    center[child, axis] = center[node, axis] + shift
+            node = child
+
+    # Evaluate: traverse with an explicit stack per body.
+    theta2 = theta * theta
+    stack = np.empty(capacity, np.int64)
+    for i in range(n):
+        fx = 0.0
+        fy = 0.0
+        fz = 0.0
+        top = 0
+        stack[top] = 0
+        top += 1
+        while top > 0:
+            top -= 1
+            node = stack[top]
+            if node_count[node] == 0:
+                continue
+            if node_body[node] == i and node_count[node] == 1:
+                continue
+            com_x = weighted_com[node, 0] / node_mass[node]
+            com_y = weighted_com[node, 1] / node_mass[node]
+            com_z = weighted_com[node, 2] / node_mass[node]
+            dx = com_x - positions[i, 0]
+            dy = com_y - positions[i, 1]
+            dz = com_z - positions[i, 2]
+            r2 = dx * dx + dy * dy + dz * dz
+            width = 2.0 * half_width[node]
+            if node_body[node] != -1 or width * width < theta2 * r2:
+                if r2 == 0.0:
+                    continue  # Collocated; skip to avoid singularity.
+                inv_r3 = r2 ** -1.5
+                fx += node_mass[node] * dx * inv_r3
+                fy += node_mass[node] * dy * inv_r3
+                fz += node_mass[node] * dz * inv_r3
+            else:
+                for octant in range(8):
+                    child = children[node, octant]
+                    if child != -1:
+                        stack[top] = child
+                        top += 1
+        scale = gravitational_constant * masses[i]
+        forces[i, 0] = fx * scale
+        forces[i, 1] = fy * scale
+        forces[i, 2] = fz * scale
+    return forces
@@ -4,7 +4,7 @@ Mutable representation of a body that belongs to a System.
 
 from __future__ import annotations
 
-from typing import Iterable, TYPE_CHECKING, Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
 
 import numpy as np
 
@@ -14,49 +14,101 @@ if TYPE_CHECKING:  # Avoid circular import during runtime
 
 class PhysicsBody:
     """
-    Represents a single point-mass tracked by a System. The System instance is
-    stored on the body as ``self.system`` so every body knows where it belongs.
+    Represents a single point-mass tracked by a System. The body is a thin
+    view over the System's structure-of-arrays state: ``position``,
+    ``velocity``, ``mass`` and ``force`` index into contiguous arrays owned
+    by ``self.system``, so the System can run the whole step as vectorized
+    NumPy kernels while bodies stay convenient to inspect individually.
     """
 
     def __init__(
         self,
         system: System,
+        index: int,
         name: str,
-        mass: float,
-        position: Iterable[float],
-        velocity: Iterable[float],
         metadata: Optional[Dict[str, Any]] = None,
+        _trust_metadata: bool = False,
     ) -> None:
         self.system = system
+        self.index = index
         self.name = name
-        self.mass = float(mass)
-        self.position = np.array(position, dtype=float)
-        self.velocity = np.array(velocity, dtype=float)
-        if self.position.shape != (3,) or self.velocity.shape != (3,):
-            raise ValueError("position and velocity must be 3‑element vectors")
-        self._force = np.zeros(3, dtype=float)
-        self.metadata: Dict[str, Any] = dict(metadata or {})
+        # Internal call sites that build metadata fresh per request pass
+        # _trust_metadata=True to skip the defensive copy.
+        if _trust_metadata and metadata is not None:
+            self.metadata: Dict[str, Any] = metadata
+        else:
+            self.metadata = dict(metadata or {})
+
+    @property
+    def mass(self) -> float:
+        return float(self.system.masses[self.index])
+
+    @mass.setter
+    def mass(self, value: float) -> None:
+        self.system.masses[self.index] = float(value)
+
+    @property
+    def position(self) -> np.ndarray:
+        """View into the System's ``positions`` array; writes go through."""
+        return self.system.positions[self.index]
+
+    @position.setter
+    def position(self, value) -> None:
+        self.system.positions[self.index] = np.asarray(value, dtype=float)
+
+    @property
+    def velocity(self) -> np.ndarray:
+        return self.system.velocities[self.index]
+
+    @velocity.setter
+    def velocity(self, value) -> None:
+        self.system.velocities[self.index] = np.asarray(value, dtype=float)
 
     @property
     def force(self) -> np.ndarray:
-        return self._force
+        return self.system.forces[self.index]
 
     def reset_force(self) -> None:
-        self._force.fill(0.0)
+        self.system.forces[self.index].fill(0.0)
 
     def apply_force(self, force: np.ndarray) -> None:
-        self._force += force
+        self.system.forces[self.index] += force
 
     def acceleration(self) -> np.ndarray:
         if self.mass == 0:
             raise ZeroDivisionError("Cannot integrate body with zero mass.")
-        return self._force / self.mass
+        return self.force / self.mass
 
     def integrate(self, dt: float) -> None:
-        """Advance velocity then position using the current net force."""
-        self.velocity += self.acceleration() * dt
-        self.position += self.velocity * dt
+        """
+        Advance velocity then position using the current net force.
+        Component-wise scalar math: no temporary arrays per call.
+        """
+        if self.mass == 0:
+            raise ZeroDivisionError("Cannot integrate body with zero mass.")
+        scale = dt / self.mass
+        force = self.force
+        velocity = self.velocity
+        position = self.position
+        velocity[0] += force[0] * scale
+        velocity[1] += force[1] * scale
+        velocity[2] += force[2] * scale
+        position[0] += velocity[0] * dt
+        position[1] += velocity[1] * dt
+        position[2] += velocity[2] * dt
+
+    def distance2_to(self, other: PhysicsBody) -> float:
+        """
+        Return squared Euclidean distance to another body. Prefer this for
+        threshold comparisons so callers can skip the square root.
+        """
+        a = self.position
+        b = other.position
+        dx = a[0] - b[0]
+        dy = a[1] - b[1]
+        dz = a[2] - b[2]
+        return dx * dx + dy * dy + dz * dz
 
     def distance_to(self, other: PhysicsBody) -> float:
         """Return Euclidean distance to another body."""
-        return float(np.linalg.norm(self.position - other.position))
+        return self.distance2_to(other) ** 0.5
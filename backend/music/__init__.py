@@ -1,4 +1,4 @@
 from .events import events_for_system
-from .note_mapping import a_to_midi, get_note_from_order
+from .note_mapping import a_to_midi, a_to_midi_batch, get_note_from_order
 
-__all__ = ["events_for_system", "a_to_midi", "get_note_from_order"]
+__all__ = ["events_for_system", "a_to_midi", "a_to_midi_batch", "get_note_from_order"]
@@ -1,5 +1,9 @@
 import math
 
+# Full turn, plus its reciprocal so hot loops can multiply instead of divide
+TAU = 2.0 * math.pi
+INV_TAU = 1.0 / TAU
+
 # MIDI range for custom bodies
 NOTE_RANGE = (48, 72)  # C3 to C5 roughly
 
@@ -11,4 +15,4 @@ NOTE_DURATION = {"mallet": 0.3, "pad": 0.6}
 
 # How many steps per orbit for pulsed notes
 ANGLE_STEPS_PER_REV = 8  # 8 notes per full orbit
-ANGLE_STEP = 2 * math.pi / ANGLE_STEPS_PER_REV
+ANGLE_STEP = TAU / ANGLE_STEPS_PER_REV
@@ -1,38 +1,49 @@
-import json
 import os
 from typing import Any, Dict, List
 
+import numpy as np
+import orjson
+
 from .planet_stats import generate_planet_stats
 from .orbit_events import planet_orbit_events
 from .velocity_pads import velocity_pad_events
-from .utils import inflate_samples
+from .utils import build_sample_tables
+
+# Debug artifacts (orbit_events.json) are opt-in; resolve the flag once at
+# import so the hot path only pays a truthiness check.
+DEBUG = os.getenv("MUSIC_DEBUG", "false").lower() == "true"
 
 
 def events_for_system(
-    samples: List[Dict[str, Any]],
+    samples: Dict[str, Any],
     planet_metadata: List[Dict[str, Any]],
     duration_sec: float,
 ) -> List[Dict[str, Any]]:
     """
-    Generate musical events for a simulated system.
+    Generate musical events for a simulated system. ``samples`` is the
+    columnar {"t", "positions"} payload produced by the physics layer.
     """
-    if not samples:
+    if not samples or len(samples.get("t", [])) == 0:
         raise ValueError("No samples provided for event generation.")
 
-    expanded_samples = inflate_samples(samples, planet_metadata)
-    if not expanded_samples:
-        raise ValueError("No valid samples after expansion for event generation.")
-
-    stats = generate_planet_stats(expanded_samples)
+    tables = build_sample_tables(samples, planet_metadata)
+    stats = generate_planet_stats(tables)
 
-    orbit_events = planet_orbit_events(expanded_samples, stats)
-    pad_events = velocity_pad_events(expanded_samples, duration_sec, stats)
+    orbit_events = planet_orbit_events(tables, stats)
+    pad_events = velocity_pad_events(tables, duration_sec, stats)
 
-    debug_enabled = os.getenv("MUSIC_DEBUG", "false").lower() == "true"
-    if debug_enabled:
-        with open("orbit_events.json", "w") as f:
-            json.dump(orbit_events, f, indent=2)
+    if DEBUG:
+        with open("orbit_events.json", "wb") as f:
+            f.write(orjson.dumps(orbit_events))
 
     events = orbit_events + pad_events
-    events.sort(key=lambda e: e["t"])
+    if events:
+        # Sort on an extracted time column: one C-level comparison key per
+        # event instead of a Python lambda call per comparison. Stable, so
+        # simultaneous events keep their emission order like list.sort did.
+        order = np.argsort(
+            np.fromiter((e["t"] for e in events), dtype=np.float64, count=len(events)),
+            kind="stable",
+        )
+        events = [events[idx] for idx in order]
     return events
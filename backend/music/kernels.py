@@ -0,0 +1,55 @@
+"""
+Numba-compiled kernels for the music analysis hot loops.
+
+Orbit detection is a scalar reduction (a running cumulative angle with a
+data-dependent trigger), which NumPy can only express through several
+temporary arrays. The compiled scan walks the angle track once and emits
+just the trigger indices. Compilation is cached on disk alongside the
+physics kernels.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from numba import njit, vectorize
+
+from .constants import INV_TAU, TAU
+
+
+@vectorize(["float64(float64)"], nopython=True, cache=True)
+def wrap_angle(delta: float) -> float:
+    """
+    Wrap an angular difference into [-pi, pi]. Compiled as a ufunc so it
+    broadcasts over whole angle tracks without per-element Python calls.
+    """
+    return (delta + math.pi) % TAU - math.pi
+
+
+@njit(cache=True, fastmath=True)
+def detect_orbit_triggers(theta: np.ndarray) -> np.ndarray:
+    """
+    Return the sample indices where a planet completes another full orbit.
+
+    ``theta`` is the angle track around the star. The cumulative angle is
+    accumulated from wrapped step differences; a trigger fires whenever
+    the truncated orbit count exceeds the highest count seen so far, so
+    retrograde motion never re-fires a completed orbit.
+    """
+    triggers = np.empty(theta.shape[0], dtype=np.int64)
+    count = 0
+    cumulative = 0.0
+    last_trigger_orbit = 0
+    prev = theta[0]
+    for idx in range(1, theta.shape[0]):
+        delta = theta[idx] - prev
+        delta = (delta + math.pi) % TAU - math.pi
+        cumulative += delta
+        prev = theta[idx]
+        orbit = int(cumulative * INV_TAU)
+        if orbit > last_trigger_orbit:
+            triggers[count] = idx
+            count += 1
+            last_trigger_orbit = orbit
+    return triggers[:count]
@@ -1,7 +1,18 @@
 import math
+from functools import lru_cache
+
+import numpy as np
+
 from .constants import NOTE_RANGE, NOTE_DURATION, RADIUS_RANGE
 
+# Semi-major axis clamp range for the MIDI mapping, with the log endpoints
+# cached so neither the scalar nor the batch path recomputes them per call
+_MIN_A, _MAX_A = 0.2, 10.0
+_LOG_MIN_A = math.log(_MIN_A)
+_LOG_RANGE_A = math.log(_MAX_A) - _LOG_MIN_A
 
+
+@lru_cache(maxsize=None)
 def get_note_from_order(order: int, max_order: int) -> int:
     """
     Map a planet's order from the star to a MIDI note using a C-major chord stack.
@@ -29,14 +40,25 @@ def a_to_midi(a_au: float) -> int:
     Smoothly map semi-major axis (aAU) to a MIDI note within NOTE_RANGE.
     Uses a logarithmic mapping so outer planets climb in pitch without clustering.
     """
-    min_a, max_a = 0.2, 10.0
-    clamped = max(min_a, min(max_a, float(a_au)))
+    clamped = max(_MIN_A, min(_MAX_A, float(a_au)))
     # Log scaling keeps progression smooth for both inner/outer planets
-    ratio = (math.log(clamped) - math.log(min_a)) / (math.log(max_a) - math.log(min_a))
+    ratio = (math.log(clamped) - _LOG_MIN_A) / _LOG_RANGE_A
     midi = NOTE_RANGE[0] + ratio * (NOTE_RANGE[1] - NOTE_RANGE[0])
     return int(round(midi))
 
 
+def a_to_midi_batch(a_au: np.ndarray) -> np.ndarray:
+    """
+    Vectorized :func:`a_to_midi`: map an array of semi-major axes to MIDI
+    notes in one ufunc chain instead of one interpreter round trip per
+    planet.
+    """
+    clamped = np.clip(np.asarray(a_au, dtype=float), _MIN_A, _MAX_A)
+    ratio = (np.log(clamped) - _LOG_MIN_A) / _LOG_RANGE_A
+    midi = NOTE_RANGE[0] + ratio * (NOTE_RANGE[1] - NOTE_RANGE[0])
+    return np.rint(midi).astype(np.int32)
+
+
 def radius_to_velocity(radius: float) -> float:
     """
     Map a planet radius to a velocity for musical purposes.
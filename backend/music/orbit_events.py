@@ -1,27 +1,29 @@
-import math
 from typing import Any, Dict, List
 
-from .note_mapping import get_note_from_order, note_duration, radius_to_velocity
+import numpy as np
+
+from .constants import RADIUS_RANGE
+from .kernels import detect_orbit_triggers
+from .note_mapping import note_duration, radius_to_velocity
 from .planet_stats import PlanetStats
-from .utils import eccentricity_to_reverb, wrapped_angle_diff
+from .utils import SampleTables, coerce_float
 
 
-def _note_events(
+def _note_template(
     planet: Dict[str, Any],
-    t: float,
     stats: PlanetStats,
     speed: float | None = None,
-) -> List[Dict[str, Any]]:
+) -> tuple[Dict[str, Any], float]:
     """
-    Create a short note pair (on/off) for a planet at time t.
-    Speed gently affects velocity and duration.
+    Precompute the invariant fields of a planet's note_on dict plus its
+    duration. Orbit completions only vary in time, so the emitter can copy
+    this template and fill in ``t`` instead of rebuilding every field.
     """
     kind = planet.get("kind")
     instrument = "mallet" if kind == "rocky" else "pad"
 
-    radius = float(planet.get("radius") or 0.0)
-    max_order = max(stats.orders.values()) if stats.orders else 0
-    midi = get_note_from_order(stats.orders.get(planet["name"], 0), max_order)
+    radius = coerce_float(planet, "radius")
+    midi = stats.midi_by_name[planet["name"]]
 
     # Map radius to velocity with wider dynamic range
     # radius_to_velocity returns 0.1-1.0, we scale this to use more of MIDI's 1-127 range
@@ -35,85 +37,53 @@ def _note_events(
     vel = max(1, min(127, vel))
 
     duration = note_duration(instrument, speed)
-    eccentricity = stats.eccentricities.get(planet["name"], 0.0)
-    reverb = eccentricity_to_reverb(eccentricity)
+    reverb = stats.reverb_by_name[planet["name"]]
 
-    return [
-        {
-            "t": t,
-            "type": "note_on",
-            "planet": planet["name"],
-            "midi": midi,
-            "vel": vel,
-            "instrument": instrument,
-            "reverb": reverb,
-        },
-        {
-            "t": t + duration,
-            "type": "note_off",
-            "planet": planet["name"],
-        },
-    ]
+    note_on = {
+        "t": 0.0,
+        "type": "note_on",
+        "planet": planet["name"],
+        "midi": midi,
+        "vel": vel,
+        "instrument": instrument,
+        "reverb": reverb,
+    }
+    return note_on, duration
 
 
-def planet_orbit_events(samples: List[Dict[str, Any]], stats: PlanetStats) -> List[Dict[str, Any]]:
+def planet_orbit_events(tables: SampleTables, stats: PlanetStats) -> List[Dict[str, Any]]:
     """
     Emit a note each time a planet completes a full orbit around the star.
 
-    Tracks cumulative angular displacement and triggers when it crosses
-    multiples of 2π.
+    Reads each rocky planet's column of the shared coordinate tensor, then
+    detects 2π crossings of the cumulative (unwrapped) angle with NumPy,
+    so per-sample Python work only happens for the handful of samples that
+    actually trigger a note.
     """
     events: List[Dict[str, Any]] = []
-    if not samples:
+    if len(tables.t) < 2 or not tables.names:
         return events
 
-    first = samples[0]
-    star_pos = stats.star_position
-
-    planet_state: Dict[str, Dict[str, float]] = {}
-    for body in first.get("planets", []):
-        if body.get("kind") == "star" or body["kind"] == "gas":
+    for body_idx, kind in enumerate(tables.kinds):
+        if kind == "star" or kind == "gas":
             continue
-        x = float(body.get("x") or 0.0) - star_pos[0]
-        y = float(body.get("y") or 0.0) - star_pos[1]
-        theta = math.atan2(y, x)
-        planet_state[body["name"]] = {
-            "last_theta": theta,
-            "cumulative_angle": 0.0,
-            "last_trigger_orbit": 0,
-        }
-
-    for sample in samples[1:]:
-        t = float(sample.get("t") or 0.0)
-        current_star_pos = stats.star_position
-        for body in sample.get("planets", []):
-            if body.get("kind") == "star":
-                current_star_pos = (
-                    float(body.get("x") or 0.0),
-                    float(body.get("y") or 0.0),
-                )
-                break
-
-        for body in sample.get("planets", []):
-            if body.get("kind") == "star":
-                continue
 
-            state = planet_state.get(body["name"])
-            if state is None:
-                continue
+        relative = tables.xy[:, body_idx, :] - tables.star_xy
+        theta = np.arctan2(relative[:, 1], relative[:, 0])
+        trigger_indices = detect_orbit_triggers(theta)
 
-            x = float(body.get("x") or 0.0) - current_star_pos[0]
-            y = float(body.get("y") or 0.0) - current_star_pos[1]
-            theta = math.atan2(y, x)
-
-            delta = wrapped_angle_diff(theta, state["last_theta"])
-            state["cumulative_angle"] += delta
-            state["last_theta"] = theta
-
-            current_orbit = int(state["cumulative_angle"] / (2 * math.pi))
-            if current_orbit > state["last_trigger_orbit"]:
-                speed = float(body.get("speed") or 0.0)
-                events.extend(_note_events(body, t, stats, speed=speed))
-                state["last_trigger_orbit"] = current_orbit
+        if len(trigger_indices) == 0:
+            continue
+        name = tables.names[body_idx]
+        body = {
+            "name": name,
+            "kind": kind,
+            "radius": tables.metadata[body_idx].get("radius", RADIUS_RANGE[0]),
+        }
+        note_on, duration = _note_template(body, stats, speed=0.0)
+        for sample_idx in trigger_indices:
+            t = float(tables.t[sample_idx])
+            events.append({**note_on, "t": t})
+            events.append({"t": t + duration, "type": "note_off", "planet": name})
 
     return events
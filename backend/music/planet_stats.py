@@ -1,55 +1,80 @@
 from dataclasses import dataclass
-import math
 from typing import Any, Dict, List, Tuple
 
-from .utils import calculate_eccentricity, get_planets_min_max_radius
+from .constants import RADIUS_RANGE
+from .note_mapping import get_note_from_order
+from .utils import (
+    SampleTables,
+    calculate_eccentricity,
+    eccentricity_to_reverb,
+    get_planets_min_max_radius,
+)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PlanetStats:
     star_position: Tuple[float, float]
     planets_sorted: List[Dict[str, Any]]
     orders: Dict[str, int]
     eccentricities: Dict[str, float]
     min_max_radii: Dict[str, Tuple[float, float]]
+    # Derived per-planet lookups, precomputed once so note emission does
+    # not recompute order maxima and mappings for every event.
+    midi_by_name: Dict[str, int]
+    reverb_by_name: Dict[str, float]
 
 
-def _find_star_position(sample: Dict[str, Any]) -> Tuple[float, float]:
-    for body in sample.get("planets", []):
-        if body.get("kind") == "star":
-            return (
-                float(body.get("x") or 0.0),
-                float(body.get("y") or 0.0),
-            )
-    raise ValueError("No star found in samples")
-
-
-def generate_planet_stats(samples: List[Dict[str, Any]]) -> PlanetStats:
-    if not samples:
+def generate_planet_stats(tables: SampleTables) -> PlanetStats:
+    if len(tables.t) == 0:
         raise ValueError("No samples provided for stat generation.")
 
-    first = samples[0]
-    star_pos = _find_star_position(first)
+    star_pos = (float(tables.star_xy[0, 0]), float(tables.star_xy[0, 1]))
+
+    first_xy = tables.xy[0]
+    planets: List[Dict[str, Any]] = []
+    for idx, meta in enumerate(tables.metadata):
+        if tables.kinds[idx] == "star":
+            continue
+        planets.append(
+            {
+                "name": tables.names[idx],
+                "kind": tables.kinds[idx],
+                "aAU": meta.get("aAU"),
+                "mass": meta.get("mass"),
+                "color": meta.get("color", "#ffffff"),
+                "radius": meta.get("radius", RADIUS_RANGE[0]),
+                "x": float(first_xy[idx, 0]),
+                "y": float(first_xy[idx, 1]),
+            }
+        )
 
+    # Squared distance orders identically to distance; skip the sqrt.
     planets_sorted = sorted(
-        (body for body in first.get("planets", []) if body.get("kind") != "star"),
-        key=lambda b: math.sqrt(
-            (float(b.get("x") or 0.0) - star_pos[0]) ** 2 +
-            (float(b.get("y") or 0.0) - star_pos[1]) ** 2
-        ),
+        planets,
+        key=lambda b: (b["x"] - star_pos[0]) ** 2 + (b["y"] - star_pos[1]) ** 2,
     )
 
     orders = {planet["name"]: order for order, planet in enumerate(planets_sorted)}
-    min_max_radii = get_planets_min_max_radius(samples)
+    min_max_radii = get_planets_min_max_radius(tables)
     eccentricities = {
         planet["name"]: calculate_eccentricity(*min_max_radii.get(planet["name"], (0.0, 0.0)))
         for planet in planets_sorted
     }
 
+    max_order = max(orders.values()) if orders else 0
+    midi_by_name = {
+        name: get_note_from_order(order, max_order) for name, order in orders.items()
+    }
+    reverb_by_name = {
+        name: eccentricity_to_reverb(ecc) for name, ecc in eccentricities.items()
+    }
+
     return PlanetStats(
         star_position=star_pos,
         planets_sorted=planets_sorted,
         orders=orders,
         eccentricities=eccentricities,
         min_max_radii=min_max_radii,
+        midi_by_name=midi_by_name,
+        reverb_by_name=reverb_by_name,
     )
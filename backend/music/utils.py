@@ -1,7 +1,20 @@
-import math
+from dataclasses import dataclass
 from typing import Any, Dict, List, Tuple
 
+import numpy as np
+
 from .constants import RADIUS_RANGE
+from .kernels import wrap_angle
+
+
+def coerce_float(mapping: Dict[str, Any], key: str, default: float = 0.0) -> float:
+    """
+    Read a numeric field as float, substituting ``default`` only when the
+    value is missing or None. Unlike the ``float(d.get(k) or 0.0)`` idiom
+    this does not silently replace a legitimate falsy value.
+    """
+    value = mapping.get(key)
+    return default if value is None else float(value)
 
 
 def calculate_eccentricity(min_r: float, max_r: float) -> float:
@@ -20,91 +33,97 @@ def eccentricity_to_reverb(eccentricity: float) -> float:
     return min_reverb + eccentricity * (max_reverb - min_reverb)
 
 
-def wrapped_angle_diff(a: float, b: float) -> float:
+def wrapped_angle_diff(a, b):
     """
-    Smallest signed angular difference a - b in [-pi, pi].
+    Smallest signed angular difference a - b in [-pi, pi]. Accepts scalars
+    or arrays; array inputs broadcast through the compiled ufunc.
     """
-    diff = (a - b + math.pi) % (2.0 * math.pi) - math.pi
-    return diff
+    return wrap_angle(np.asarray(a, dtype=float) - b)
 
 
 def downsample_envelope(
-    envelope: List[Dict[str, float]], duration_sec: float, target_hz: float = 5.0
-) -> List[Dict[str, float]]:
+    t: np.ndarray, values: np.ndarray, duration_sec: float, target_hz: float = 5.0
+) -> Tuple[np.ndarray, np.ndarray]:
     """
     Reduce envelope density to roughly target_hz samples per second to shrink
     payload size while preserving shape. Always retains first/last points.
+    Operates on parallel (t, values) arrays so discarded points are never
+    materialized downstream.
     """
-    if duration_sec <= 0 or len(envelope) <= 2:
-        return envelope
+    n = len(t)
+    if duration_sec <= 0 or n <= 2:
+        return t, values
 
     target_count = max(2, int(duration_sec * target_hz))
-    if len(envelope) <= target_count:
-        return envelope
+    if n <= target_count:
+        return t, values
 
-    step = max(1, len(envelope) // target_count)
-    downsampled = envelope[::step]
+    step = max(1, n // target_count)
+    idx = np.arange(0, n, step)
+    if t[idx[-1]] != t[-1]:
+        idx = np.append(idx, n - 1)
 
-    if downsampled[-1]["t"] != envelope[-1]["t"]:
-        downsampled.append(envelope[-1])
+    return t[idx], values[idx]
 
-    return downsampled
 
-
-def inflate_samples(
-    samples: List[Dict[str, Any]], planet_metadata: List[Dict[str, Any]]
-) -> List[Dict[str, Any]]:
+@dataclass
+class SampleTables:
     """
-    Expand compact trajectory samples (positions only) into the richer shape
-    expected by the music generation routines.
+    Structure-of-arrays view of a trajectory: one time vector plus an
+    (T, N, 2) coordinate tensor, with per-body name/kind/metadata lists
+    indexed by column. Built once per request so the music analyses run
+    as array passes instead of per-sample dict traversal.
     """
-    inflated: List[Dict[str, Any]] = []
 
-    for sample in samples:
-        positions = sample.get("positions") or []
-        planets: List[Dict[str, Any]] = []
+    t: np.ndarray  # (T,)
+    xy: np.ndarray  # (T, N, 2) float64
+    names: List[str]
+    kinds: List[str]
+    metadata: List[Dict[str, Any]]
+    star_xy: np.ndarray  # (T, 2)
+
 
-        for idx, meta in enumerate(planet_metadata):
-            pos = positions[idx] if idx < len(positions) else [0.0, 0.0]
-            x = float(pos[0]) if len(pos) > 0 else 0.0
-            y = float(pos[1]) if len(pos) > 1 else 0.0
+def build_sample_tables(
+    samples: Dict[str, Any], planet_metadata: List[Dict[str, Any]]
+) -> SampleTables:
+    """
+    Convert the columnar {"t", "positions"} payload and its metadata list
+    into a :class:`SampleTables`. Raises when the system lacks a star,
+    mirroring the old per-sample star scan.
+    """
+    t = np.asarray(samples["t"], dtype=float)
+    xy = np.asarray(samples["positions"], dtype=float)
 
-            planets.append(
-                {
-                    "name": meta.get("name", f"planet_{idx}"),
-                    "kind": meta.get("kind", "rocky"),
-                    "aAU": meta.get("aAU"),
-                    "mass": meta.get("mass"),
-                    "color": meta.get("color", "#ffffff"),
-                    "radius": meta.get("radius", RADIUS_RANGE[0]),
-                    "x": x,
-                    "y": y,
-                }
-            )
+    names = [meta.get("name", f"planet_{idx}") for idx, meta in enumerate(planet_metadata)]
+    kinds = [meta.get("kind", "rocky") for meta in planet_metadata]
 
-        inflated.append({"t": float(sample.get("t") or 0.0), "planets": planets})
+    try:
+        star_idx = kinds.index("star")
+    except ValueError:
+        raise ValueError("No star found in samples")
 
-    return inflated
+    return SampleTables(
+        t=t,
+        xy=xy,
+        names=names,
+        kinds=kinds,
+        metadata=list(planet_metadata),
+        star_xy=xy[:, star_idx, :],
+    )
 
 
-def get_planets_min_max_radius(samples: List[Dict[str, Any]]) -> Dict[str, Tuple[float, float]]:
+def get_planets_min_max_radius(tables: SampleTables) -> Dict[str, Tuple[float, float]]:
     """
     Calculate min and max radius for each planet across all samples.
     Returns a dict mapping planet name to (min_radius, max_radius).
     """
-    planet_radii: Dict[str, List[float]] = {}
-    for sample in samples:
-        for body in sample.get("planets", []):
-            if body.get("kind") == "star":
-                continue
-            name = body["name"]
-            x = float(body.get("x") or 0.0)
-            y = float(body.get("y") or 0.0)
-            r = math.sqrt(x * x + y * y)
-            planet_radii.setdefault(name, []).append(r)
+    radii = np.hypot(tables.xy[:, :, 0], tables.xy[:, :, 1])  # (T, N)
 
     planet_min_max: Dict[str, Tuple[float, float]] = {}
-    for name, radii in planet_radii.items():
-        planet_min_max[name] = (min(radii), max(radii))
+    for idx, name in enumerate(tables.names):
+        if tables.kinds[idx] == "star":
+            continue
+        column = radii[:, idx]
+        planet_min_max[name] = (float(column.min()), float(column.max()))
 
     return planet_min_max
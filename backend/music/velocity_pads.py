@@ -1,92 +1,66 @@
-import math
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List
 
-from .note_mapping import get_note_from_order, radius_to_velocity
-from .planet_stats import PlanetStats
-from .utils import downsample_envelope, eccentricity_to_reverb
-
-
-def _collect_velocity_samples(
-    samples: List[Dict[str, Any]], planet_name: str
-) -> List[Tuple[float, float]]:
-    """
-    Single-pass extraction of velocity samples for a gas planet.
-    """
-    last_position = None
-    velocity_samples: List[Tuple[float, float]] = []
-
-    for sample in samples:
-        t = float(sample.get("t") or 0.0)
-
-        for body in sample.get("planets", []):
-            if body["name"] != planet_name:
-                continue
-
-            x = float(body.get("x") or 0.0)
-            y = float(body.get("y") or 0.0)
+import numpy as np
 
-            if last_position is not None:
-                t_prev, x_prev, y_prev = last_position
-                dt = t - t_prev
-                if dt > 0:
-                    dx = x - x_prev
-                    dy = y - y_prev
-                    distance = math.sqrt(dx * dx + dy * dy)
-                    speed = distance / dt
-                    velocity_samples.append((t, speed))
-
-            last_position = (t, x, y)
-            break
-
-    return velocity_samples
+from .constants import RADIUS_RANGE
+from .note_mapping import radius_to_velocity
+from .planet_stats import PlanetStats
+from .utils import SampleTables, coerce_float, downsample_envelope
 
 
-def velocity_pad_events(samples: List[Dict[str, Any]], duration_sec: float, stats: PlanetStats) -> List[Dict[str, Any]]:
+def velocity_pad_events(
+    tables: SampleTables, duration_sec: float, stats: PlanetStats
+) -> List[Dict[str, Any]]:
     """
     Create continuous pad tones for gas giants that modulate in volume
-    based on their orbital velocity at each moment.
+    based on their orbital velocity at each moment. Speeds come from one
+    finite-difference pass over each planet's coordinate column.
     """
     events: List[Dict[str, Any]] = []
-    if not samples or len(samples) < 2:
+    if len(tables.t) < 2:
         return events
 
-    first = samples[0]
-    gas_planets = [body for body in first.get("planets", []) if body.get("kind") == "gas"]
-    if not gas_planets:
+    gas_indices = [idx for idx, kind in enumerate(tables.kinds) if kind == "gas"]
+    if not gas_indices:
         return events
 
-    max_order = max(stats.orders.values()) if stats.orders else 0
+    dt = np.diff(tables.t)
+    valid = dt > 0
 
-    for gas_planet in gas_planets:
-        name = gas_planet["name"]
-        velocity_samples = _collect_velocity_samples(samples, name)
-        if not velocity_samples:
+    for body_idx in gas_indices:
+        name = tables.names[body_idx]
+        xy = tables.xy[:, body_idx, :]
+        dx = np.diff(xy[:, 0])
+        dy = np.diff(xy[:, 1])
+        speeds = np.sqrt(dx * dx + dy * dy)[valid] / dt[valid]
+        if len(speeds) == 0:
             continue
 
-        speeds = [v[1] for v in velocity_samples]
-        min_speed = min(speeds)
-        max_speed = max(speeds)
-        speed_range = max_speed - min_speed
-
-        velocity_envelope = []
-        for t, speed in velocity_samples:
-            if speed_range > 0.0001:
-                normalized = (speed - min_speed) / speed_range
-            else:
-                normalized = 0.5
-
-            normalized = 0.2 + normalized * 0.8
-            velocity_envelope.append({"t": t, "velocity": normalized})
-
-        velocity_envelope = downsample_envelope(velocity_envelope, duration_sec)
-
-        midi = get_note_from_order(stats.orders[name], max_order)
+        min_speed = float(speeds.min())
+        speed_range = float(speeds.max()) - min_speed
+        if speed_range > 0.0001:
+            # Normalize and scale in place: speeds is a fresh temporary, so
+            # no extra envelope-sized arrays are allocated.
+            normalized = np.subtract(speeds, min_speed, out=speeds)
+            normalized /= speed_range
+        else:
+            normalized = np.full_like(speeds, 0.5)
+        normalized *= 0.8
+        normalized += 0.2
+
+        t_env, normalized = downsample_envelope(tables.t[1:][valid], normalized, duration_sec)
+        velocity_envelope = [
+            {"t": t, "velocity": velocity}
+            for t, velocity in zip(t_env.tolist(), normalized.tolist())
+        ]
+
+        midi = stats.midi_by_name[name]
         eccentricity = stats.eccentricities.get(name, 0.0)
-        reverb = eccentricity_to_reverb(eccentricity)
+        reverb = stats.reverb_by_name[name]
 
         # Map radius to velocity with wider dynamic range for gas giants
         # radius_to_velocity returns 0.1-1.0
-        radius = float(gas_planet.get("radius") or 0.0)
+        radius = coerce_float(tables.metadata[body_idx], "radius", RADIUS_RANGE[0])
         radius_factor = radius_to_velocity(radius)
         # Gas giants (pads): softer base, moderate range (40-110)
         base_vel = int(10 + radius_factor * 70)
@@ -7,12 +7,16 @@ numbers remain readable and render nicely in the 2D plane.
 from __future__ import annotations
 
 import math
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from .system import System
 
 SIM_G = 0.01  # Tuned gravitational constant for simplified masses/lengths
 STAR_MASS_SCALE = 100.0  # Amplify star mass so planets orbit sensibly
+KEPLER_MASS_RATIO_MAX = 1e-3  # Planets below this fraction of star mass don't perturb
+WIRE_DECIMALS = 4  # 1e-4 AU is sub-pixel on screen; full float repr is ~10x the bytes
 
 
 def period_days(aAU: float) -> float:
@@ -44,34 +48,43 @@ def _build_initial_bodies(system_cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
         }
     ]
 
+    positions: List[List[float]] = []
+    velocities: List[Optional[List[float]]] = []
     for planet in system_cfg["planets"]:
-        distance = planet["aAU"]
         position = planet.get("position")
-        velocity = planet.get("velocity")
-
         if position is not None:
-            position_vec = _vector3(position)
+            positions.append(_vector3(position))
         else:
-            position_vec = [distance, 0.0, 0.0]
+            positions.append([planet["aAU"], 0.0, 0.0])
+        velocity = planet.get("velocity")
+        velocities.append(None if velocity is None else _vector3(velocity))
 
-        if velocity is not None:
-            velocity_vec = _vector3(velocity)
-        else:
-            dist_xy = math.hypot(position_vec[0], position_vec[1])
-            if dist_xy > 0:
-                speed = math.sqrt(SIM_G * star_mass / dist_xy)
-                direction = [-position_vec[1] / dist_xy, position_vec[0] / dist_xy, 0.0]
-                ellipticity = float(planet.get("ellipticity") or 0.0)
-                ellipticity = max(0.0, min(ellipticity, 0.95))
-                velocity_scale = 1.0 - 0.5 * ellipticity
-                velocity_vec = [
-                    direction[0] * speed * velocity_scale,
-                    direction[1] * speed * velocity_scale,
-                    0.0,
-                ]
-            else:
-                velocity_vec = [0.0, 0.0, 0.0]
+    derive = [idx for idx, vel in enumerate(velocities) if vel is None]
+    if derive:
+        # Circular-orbit speeds for every planet without an explicit
+        # velocity, in one broadcast pass instead of per-planet math calls.
+        pos_xy = np.array([positions[idx][:2] for idx in derive])
+        dist_xy = np.hypot(pos_xy[:, 0], pos_xy[:, 1])
+        ellipticity = np.array(
+            [
+                float(system_cfg["planets"][idx].get("ellipticity") or 0.0)
+                for idx in derive
+            ]
+        )
+        velocity_scale = 1.0 - 0.5 * np.clip(ellipticity, 0.0, 0.95)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            speed = np.sqrt(SIM_G * star_mass / dist_xy)
+            direction = np.column_stack(
+                [-pos_xy[:, 1] / dist_xy, pos_xy[:, 0] / dist_xy]
+            )
+        vel_xy = direction * speed[:, None] * velocity_scale[:, None]
+        vel_xy[dist_xy == 0] = 0.0  # Planet on the star: no tangent direction
+        for row, idx in enumerate(derive):
+            velocities[idx] = [float(vel_xy[row, 0]), float(vel_xy[row, 1]), 0.0]
 
+    for planet, position_vec, velocity_vec in zip(
+        system_cfg["planets"], positions, velocities
+    ):
         metadata = {**planet, "visible": True}
         bodies.append(
             {
@@ -85,16 +98,17 @@ def _build_initial_bodies(system_cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
     return bodies
 
 
-def _extract_metadata(first_sample: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[str]]:
+def _extract_metadata(initial_bodies: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[int]]:
     """
-    Pull shared, static metadata from the first sample and preserve ordering
-    so position arrays can be zipped back together later.
+    Build the shared, static per-planet metadata straight from the initial
+    body configs, returning the kept body indices so position columns can
+    be sliced out of the trajectory buffer later.
     """
     planet_metadata: List[Dict[str, Any]] = []
-    ordered_names: List[str] = []
+    kept_indices: List[int] = []
 
-    for body in first_sample.get("bodies", []):
-        metadata = dict(body.get("metadata") or {})
+    for idx, body in enumerate(initial_bodies):
+        metadata = body.get("metadata") or {}
         if metadata.get("visible", True) is False:
             continue
 
@@ -111,46 +125,177 @@ def _extract_metadata(first_sample: Dict[str, Any]) -> Tuple[List[Dict[str, Any]
                 "aAU": metadata.get("aAU", math.hypot(x, y)),
             }
         )
-        ordered_names.append(body["name"])
+        kept_indices.append(idx)
 
-    return planet_metadata, ordered_names
+    return planet_metadata, kept_indices
 
 
-def samples_for_system(system_cfg: Dict[str, Any], duration_sec: float, dt_sec: float):
-    if dt_sec <= 0:
-        raise ValueError("dtSec must be positive")
-    system = System(
-        name="User system",
-        gravitational_constant=SIM_G,
-        initial_bodies=_build_initial_bodies(system_cfg),
-    )
-    sample_rate = 1.0 / dt_sec
-    raw_samples = system.sample_positions(
-        duration_seconds=duration_sec, sample_rate_hz=sample_rate
+def solve_kepler(mean_anomaly: np.ndarray, eccentricity, iterations: int = 4) -> np.ndarray:
+    """
+    Solve Kepler's equation E - e*sin(E) = M with fixed-iteration Newton
+    steps, vectorized over the whole time axis (and, via broadcasting, over
+    a (T, N) grid of planets at once). Four iterations reach machine
+    precision for e < 0.9.
+    """
+    eccentric_anomaly = mean_anomaly + eccentricity * np.sin(mean_anomaly)
+    for _ in range(iterations):
+        eccentric_anomaly -= (
+            eccentric_anomaly - eccentricity * np.sin(eccentric_anomaly) - mean_anomaly
+        ) / (1.0 - eccentricity * np.cos(eccentric_anomaly))
+    return eccentric_anomaly
+
+
+def _kepler_elements(position: List[float], velocity: List[float], mu: float) -> Optional[Dict[str, float]]:
+    """
+    Derive planar orbital elements (a, e, omega, M0, n, spin) from an
+    initial state vector around a fixed star at the origin. Returns None
+    for unbound or degenerate orbits, which fall back to the integrator.
+    """
+    x, y = position[0], position[1]
+    vx, vy = velocity[0], velocity[1]
+    r = math.hypot(x, y)
+    if r == 0:
+        return None
+    v2 = vx * vx + vy * vy
+    energy = 0.5 * v2 - mu / r
+    if energy >= 0:
+        return None  # Unbound
+    a = -mu / (2.0 * energy)
+    h = x * vy - y * vx  # z-component of specific angular momentum
+    spin = 1.0 if h >= 0 else -1.0
+
+    # Eccentricity vector: e_vec = ((v^2 - mu/r) r_vec - (r.v) v_vec) / mu
+    rv = x * vx + y * vy
+    ex = ((v2 - mu / r) * x - rv * vx) / mu
+    ey = ((v2 - mu / r) * y - rv * vy) / mu
+    e = math.hypot(ex, ey)
+    if e >= 1.0:
+        return None
+
+    if e > 1e-12:
+        omega = math.atan2(ey, ex)
+        cos_e0 = (1.0 - r / a) / e
+        sin_e0 = rv / (e * math.sqrt(mu * a))
+        eccentric_anomaly0 = math.atan2(sin_e0, cos_e0)
+    else:
+        # Circular orbit: periapsis direction is arbitrary.
+        e = 0.0
+        omega = 0.0
+        eccentric_anomaly0 = math.atan2(spin * y, x)
+
+    mean_anomaly0 = eccentric_anomaly0 - e * math.sin(eccentric_anomaly0)
+    n = math.sqrt(mu / a**3)
+    return {"a": a, "e": e, "omega": omega, "M0": mean_anomaly0, "n": n, "spin": spin}
+
+
+def _kepler_positions(elements: List[Dict[str, float]], t: np.ndarray) -> np.ndarray:
+    """
+    Evaluate every planet's (x, y) positions in one broadcast pass:
+    mean anomalies form a (T, N) grid and a single Newton sweep solves all
+    orbits simultaneously. Returns a (T, N, 2) array.
+    """
+    a = np.array([el["a"] for el in elements])
+    e = np.array([el["e"] for el in elements])
+    omega = np.array([el["omega"] for el in elements])
+    mean_anomaly0 = np.array([el["M0"] for el in elements])
+    n = np.array([el["n"] for el in elements])
+    spin = np.array([el["spin"] for el in elements])
+
+    mean_anomaly = mean_anomaly0[None, :] + n[None, :] * t[:, None]
+    eccentric_anomaly = solve_kepler(mean_anomaly, e[None, :])
+    # Perifocal frame, then rotate by the argument of periapsis.
+    px = a * (np.cos(eccentric_anomaly) - e)
+    py = a * np.sqrt(1.0 - e * e) * np.sin(eccentric_anomaly) * spin
+    cos_w = np.cos(omega)
+    sin_w = np.sin(omega)
+    return np.stack([px * cos_w - py * sin_w, px * sin_w + py * cos_w], axis=-1)
+
+
+def _kepler_orbit_samples(
+    initial_bodies: List[Dict[str, Any]], duration_sec: float, dt_sec: float
+) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Analytic fast path: when planets are too light to perturb each other or
+    the star, evaluate each orbit in closed form over the whole time axis
+    instead of stepping the integrator. Returns the same columnar
+    {"t": (T,), "positions": (T, N, 2)} shape as the integrator path, with
+    body columns in ``initial_bodies`` order, or None when the
+    configuration needs full numerical integration.
+    """
+    star_index = next(
+        (
+            idx
+            for idx, b in enumerate(initial_bodies)
+            if (b.get("metadata") or {}).get("kind") == "star"
+        ),
+        None,
     )
+    if star_index is None:
+        return None
+    star = initial_bodies[star_index]
+    planet_indices = [idx for idx in range(len(initial_bodies)) if idx != star_index]
+    if any(
+        (initial_bodies[idx].get("metadata") or {}).get("kind") == "star"
+        for idx in planet_indices
+    ):
+        return None
+    if any(star["position"]) or any(star["velocity"]):
+        return None
+    star_mass = float(star["mass"])
+    if star_mass <= 0:
+        return None
 
-    if not raw_samples:
-        return {"planetMetadata": [], "samples": []}
+    mu = SIM_G * star_mass
+    per_planet_elements = []
+    for idx in planet_indices:
+        planet = initial_bodies[idx]
+        if float(planet["mass"]) > KEPLER_MASS_RATIO_MAX * star_mass:
+            return None
+        if planet["position"][2] != 0.0 or planet["velocity"][2] != 0.0:
+            return None
+        elements = _kepler_elements(planet["position"], planet["velocity"], mu)
+        if elements is None:
+            return None
+        per_planet_elements.append(elements)
 
-    planet_metadata, ordered_names = _extract_metadata(raw_samples[0])
-    name_to_index = {name: idx for idx, name in enumerate(ordered_names)}
+    # Match the integrator's sampling grid (t=0 plus `steps` steps of dt).
+    steps = max(1, math.ceil(duration_sec / dt_sec))
+    t = np.arange(steps + 1) * dt_sec
 
-    samples: List[Dict[str, Any]] = []
-    for sample in raw_samples:
-        positions: List[List[float]] = [[0.0, 0.0] for _ in ordered_names]
+    # The star column stays at the origin; planet columns come straight
+    # from the broadcast Kepler solve, so no per-sample dicts are built.
+    positions = np.zeros((steps + 1, len(initial_bodies), 2))
+    positions[:, planet_indices, :] = _kepler_positions(per_planet_elements, t)
+    return {"t": t, "positions": positions}
 
-        for body in sample.get("bodies", []):
-            metadata = dict(body.get("metadata") or {})
-            if metadata.get("visible", True) is False:
-                continue
 
-            idx = name_to_index.get(body["name"])
-            if idx is None:
-                continue
+def samples_for_system(system_cfg: Dict[str, Any], duration_sec: float, dt_sec: float):
+    if dt_sec <= 0:
+        raise ValueError("dtSec must be positive")
+    initial_bodies = _build_initial_bodies(system_cfg)
+    planet_metadata, kept_indices = _extract_metadata(initial_bodies)
 
-            pos = body.get("position") or [0.0, 0.0, 0.0]
-            positions[idx] = [float(pos[0]), float(pos[1])]
+    trajectory = _kepler_orbit_samples(initial_bodies, duration_sec, dt_sec)
+    if trajectory is not None:
+        t = trajectory["t"]
+        positions = trajectory["positions"][:, kept_indices, :].astype(np.float32)
+    else:
+        system = System(name="User system", gravitational_constant=SIM_G)
+        # Metadata dicts are built fresh per request; skip the defensive copy.
+        system.add_bodies(initial_bodies, _trust_metadata=True)
+        trajectory = system.sample_positions(
+            duration_seconds=duration_sec, dt_sec=dt_sec
+        )
+        t = trajectory["t"]
+        # Slice the visible bodies' xy columns straight out of the sampler's
+        # trajectory buffer; no per-sample dicts are ever materialized.
+        positions = trajectory["positions"][:, kept_indices, :2].astype(np.float32)
 
-        samples.append({"t": float(sample.get("t") or 0.0), "positions": positions})
+    if len(t) == 0:
+        return {"planetMetadata": [], "samples": {"t": [], "positions": []}}
 
-    return {"planetMetadata": planet_metadata, "samples": samples}
+    # Columnar output: one t vector plus a single (T, N, 2) position tensor.
+    # float32 plus rounding keeps the serialized floats short, and orjson
+    # emits the arrays directly without T per-sample dicts.
+    np.round(positions, WIRE_DECIMALS, out=positions)
+    return {"planetMetadata": planet_metadata, "samples": {"t": t, "positions": positions}}
@@ -0,0 +1,157 @@
+"""
+Numba-compiled kernels for the N-body hot loop.
+
+The direct-summation kernel streams through the System's SoA arrays,
+processing targets in 8-wide tiles: the innermost fixed-size lane loop has
+no data-dependent branches (pair eligibility is folded into multiplicative
+0/1 weights), so LLVM auto-vectorizes it into AVX FMAs instead of scalar
+code. Compilation is cached on disk so worker restarts skip the JIT
+cold-start.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, prange
+
+_TILE = 8  # Lanes per tile; matches one AVX-512 / two AVX2 float64 vectors
+
+
+@njit(cache=True, fastmath=True, parallel=True, boundscheck=False)
+def compute_forces(
+    positions: np.ndarray,
+    masses: np.ndarray,
+    is_star: np.ndarray,
+    forces: np.ndarray,
+    gravitational_constant: float,
+    cull_distance: float,
+) -> None:
+    """
+    Fill ``forces`` with the net gravitational force on each body.
+
+    Star interactions are always applied (but never star-star);
+    planet-planet interactions are culled beyond ``cull_distance`` in the
+    orbital plane, matching System's pair semantics. Collocated pairs are
+    skipped to avoid the singularity.
+    """
+    n = positions.shape[0]
+    cull2 = cull_distance * cull_distance
+    num_tiles = (n + _TILE - 1) // _TILE
+    for tile in prange(num_tiles):
+        i0 = tile * _TILE
+        width = min(_TILE, n - i0)
+        fx = np.zeros(_TILE)
+        fy = np.zeros(_TILE)
+        fz = np.zeros(_TILE)
+        for j in range(n):
+            xj = positions[j, 0]
+            yj = positions[j, 1]
+            zj = positions[j, 2]
+            mj = masses[j]
+            star_j = 1.0 if is_star[j] else 0.0
+            for lane in range(width):
+                i = i0 + lane
+                dx = xj - positions[i, 0]
+                dy = yj - positions[i, 1]
+                dz = zj - positions[i, 2]
+                d2_xy = dx * dx + dy * dy
+                r2 = d2_xy + dz * dz
+
+                star_i = 1.0 if is_star[i] else 0.0
+                both_stars = star_i * star_j
+                either_star = star_i + star_j - both_stars
+                within_cull = 1.0 if d2_xy <= cull2 else 0.0
+                nonzero = 1.0 if r2 > 0.0 else 0.0  # Also masks i == j
+                weight = (
+                    (1.0 - both_stars)
+                    * (either_star + (1.0 - either_star) * within_cull)
+                    * nonzero
+                )
+
+                r2_safe = r2 + (1.0 - nonzero)  # Keep **-1.5 finite when masked
+                scaled = weight * mj * r2_safe ** -1.5
+                fx[lane] += dx * scaled
+                fy[lane] += dy * scaled
+                fz[lane] += dz * scaled
+        for lane in range(width):
+            i = i0 + lane
+            scale = gravitational_constant * masses[i]
+            forces[i, 0] = fx[lane] * scale
+            forces[i, 1] = fy[lane] * scale
+            forces[i, 2] = fz[lane] * scale
+
+
+@njit(cache=True, fastmath=True, parallel=True, boundscheck=False)
+def step_bodies(
+    positions_old: np.ndarray,
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    masses: np.ndarray,
+    is_star: np.ndarray,
+    forces: np.ndarray,
+    gravitational_constant: float,
+    cull_distance: float,
+    dt: float,
+) -> None:
+    """
+    Fused force + semi-implicit Euler step: accumulate each body's
+    acceleration and immediately advance its velocity and position in the
+    same pass over memory, instead of a forces pass followed by an
+    integration pass. Forces are read from the ``positions_old`` snapshot
+    so the update stays order-independent; net forces are still written
+    out for inspection.
+    """
+    n = positions.shape[0]
+    cull2 = cull_distance * cull_distance
+    num_tiles = (n + _TILE - 1) // _TILE
+    for tile in prange(num_tiles):
+        i0 = tile * _TILE
+        width = min(_TILE, n - i0)
+        fx = np.zeros(_TILE)
+        fy = np.zeros(_TILE)
+        fz = np.zeros(_TILE)
+        for j in range(n):
+            xj = positions_old[j, 0]
+            yj = positions_old[j, 1]
+            zj = positions_old[j, 2]
+            mj = masses[j]
+            star_j = 1.0 if is_star[j] else 0.0
+            for lane in range(width):
+                i = i0 + lane
+                dx = xj - positions_old[i, 0]
+                dy = yj - positions_old[i, 1]
+                dz = zj - positions_old[i, 2]
+                d2_xy = dx * dx + dy * dy
+                r2 = d2_xy + dz * dz
+
+                star_i = 1.0 if is_star[i] else 0.0
+                both_stars = star_i * star_j
+                either_star = star_i + star_j - both_stars
+                within_cull = 1.0 if d2_xy <= cull2 else 0.0
+                nonzero = 1.0 if r2 > 0.0 else 0.0
+                weight = (
+                    (1.0 - both_stars)
+                    * (either_star + (1.0 - either_star) * within_cull)
+                    * nonzero
+                )
+
+                r2_safe = r2 + (1.0 - nonzero)
+                scaled = weight * mj * r2_safe ** -1.5
+                fx[lane] += dx * scaled
+                fy[lane] += dy * scaled
+                fz[lane] += dz * scaled
+        for lane in range(width):
+            i = i0 + lane
+            # Acceleration is G * sum(m_j dr / r^3): body mass cancels.
+            ax = fx[lane] * gravitational_constant
+            ay = fy[lane] * gravitational_constant
+            az = fz[lane] * gravitational_constant
+            forces[i, 0] = ax * masses[i]
+            forces[i, 1] = ay * masses[i]
+            forces[i, 2] = az * masses[i]
+            velocities[i, 0] += ax * dt
+            velocities[i, 1] += ay * dt
+            velocities[i, 2] += az * dt
+            positions[i, 0] = positions_old[i, 0] + velocities[i, 0] * dt
+            positions[i, 1] = positions_old[i, 1] + velocities[i, 1] * dt
+            positions[i, 2] = positions_old[i, 2] + velocities[i, 2] * dt
@@ -8,18 +8,22 @@ import math
 from typing import Iterable, List, Optional, Sequence, Dict, Any
 
 import numpy as np
-from fastquadtree import QuadTree
 
+from .barnes_hut import THETA_DEFAULT, compute_forces_bh
 from .body import PhysicsBody
+from .physics_kernels import compute_forces, step_bodies
 
 G_DEFAULT = 6.67430e-11  # m^3 kg^-1 s^-2
 CULL_DISTANCE_AU = 1.0  # Skip planet-planet forces beyond this distance
+BARNES_HUT_MIN_BODIES = 64  # Above this, O(N log N) octree beats direct summation
 
 
 class System:
     """
-    Container that owns Body instances and computes pairwise gravity so bodies
-    can integrate their trajectories.
+    Container that owns the simulation state as structure-of-arrays NumPy
+    buffers (``positions``, ``velocities``, ``masses``, ``forces``) and
+    computes pairwise gravity with vectorized kernels. Individual
+    :class:`PhysicsBody` instances are thin views into these arrays.
     """
 
     def __init__(
@@ -30,6 +34,16 @@ class System:
     ):
         self.name = name
         self.gravitational_constant = gravitational_constant
+        self.positions = np.zeros((0, 3), dtype=float)
+        self.velocities = np.zeros((0, 3), dtype=float)
+        self.masses = np.zeros(0, dtype=float)
+        self.forces = np.zeros((0, 3), dtype=float)
+        # Hot metadata promoted to a dedicated array: the force kernel needs
+        # each body's star-ness every step, and per-step dict lookups defeat
+        # both the cache and Numba. Latched when the body is added.
+        self.is_star = np.zeros(0, dtype=np.bool_)
+        self._accel_buf = np.zeros((0, 3), dtype=float)  # Scratch for allocation-free stepping
+        self._verlet_accel: Optional[np.ndarray] = None  # Carried acceleration for step_verlet
         self.bodies: List[PhysicsBody] = []
         if initial_bodies:
             self.add_bodies(initial_bodies)
@@ -41,12 +55,33 @@ class System:
         position: Iterable[float],
         velocity: Iterable[float],
         metadata: Optional[Dict[str, Any]] = None,
+        _trust_metadata: bool = False,
     ) -> PhysicsBody:
-        body = PhysicsBody(self, name, mass, position, velocity, metadata=metadata)
+        position = np.asarray(list(position), dtype=float)
+        velocity = np.asarray(list(velocity), dtype=float)
+        if position.shape != (3,) or velocity.shape != (3,):
+            raise ValueError("position and velocity must be 3‑element vectors")
+        self.positions = np.vstack([self.positions, position])
+        self.velocities = np.vstack([self.velocities, velocity])
+        self.masses = np.append(self.masses, float(mass))
+        self.forces = np.vstack([self.forces, np.zeros(3, dtype=float)])
+        self.is_star = np.append(
+            self.is_star, (metadata or {}).get("kind") == "star"
+        )
+        body = PhysicsBody(
+            self,
+            len(self.bodies),
+            name,
+            metadata=metadata,
+            _trust_metadata=_trust_metadata,
+        )
         self.bodies.append(body)
+        self._verlet_accel = None
         return body
 
-    def add_bodies(self, configs: Sequence[dict]) -> List[PhysicsBody]:
+    def add_bodies(
+        self, configs: Sequence[dict], _trust_metadata: bool = False
+    ) -> List[PhysicsBody]:
         created = []
         for cfg in configs:
             created.append(
@@ -56,155 +91,163 @@ class System:
                     position=cfg["position"],
                     velocity=cfg["velocity"],
                     metadata=cfg.get("metadata"),
+                    _trust_metadata=_trust_metadata,
                 )
             )
         return created
 
     def remove_body(self, name: str) -> None:
-        self.bodies = [b for b in self.bodies if b.name != name]
+        keep = [idx for idx, b in enumerate(self.bodies) if b.name != name]
+        self.positions = self.positions[keep]
+        self.velocities = self.velocities[keep]
+        self.masses = self.masses[keep]
+        self.forces = self.forces[keep]
+        self.is_star = self.is_star[keep]
+        self.bodies = [self.bodies[idx] for idx in keep]
+        self._verlet_accel = None
+        for new_index, body in enumerate(self.bodies):
+            body.index = new_index
 
     def get_body(self, name: str) -> Optional[PhysicsBody]:
         return next((b for b in self.bodies if b.name == name), None)
 
     def total_mass(self) -> float:
-        return sum(body.mass for body in self.bodies)
+        return float(self.masses.sum())
 
     def _compute_gravity(self) -> None:
         """
-        Compute pairwise gravity. Star interactions are always applied.
-        Planet-planet interactions are culled if planets are >1 AU apart,
-        using a QuadTree to avoid O(n^2) scans.
+        Compute pairwise gravity with the compiled direct-summation kernel,
+        which streams the SoA arrays without materializing the (N, N, 3)
+        displacement tensor the broadcast formulation needs. Large systems
+        switch to the Barnes-Hut octree, which approximates far-field
+        contributions with cell centers of mass (the distance cull becomes
+        irrelevant at that scale since far pairs collapse into aggregates).
         """
-        for body in self.bodies:
-            body.reset_force()
-        if not self.bodies:
+        n = len(self.bodies)
+        if n < 2:
+            self.forces.fill(0.0)
             return
-
-        def apply_force_pair(primary: PhysicsBody, secondary: PhysicsBody) -> None:
-            offset = secondary.position - primary.position
-            distance = np.linalg.norm(offset)
-            if distance == 0:
-                return  # Collocated bodies; skip to avoid singularity.
-            direction = offset / distance
-            magnitude = (
-                self.gravitational_constant * primary.mass * secondary.mass / distance**2
+        if n >= BARNES_HUT_MIN_BODIES:
+            self.forces[:] = compute_forces_bh(
+                self.positions, self.masses, self.gravitational_constant, THETA_DEFAULT
             )
-            force = magnitude * direction
-            primary.apply_force(force)
-            secondary.apply_force(-force)
-
-        stars: List[PhysicsBody] = [
-            body for body in self.bodies if (body.metadata or {}).get("kind") == "star"
-        ]
-        non_stars: List[PhysicsBody] = [
-            body for body in self.bodies if (body.metadata or {}).get("kind") != "star"
-        ]
-
-        # Always apply star ↔ body interactions (no distance cull).
-        for star in stars:
-            for other in non_stars:
-                apply_force_pair(star, other)
-
-        if len(non_stars) < 2:
             return
+        compute_forces(
+            self.positions,
+            self.masses,
+            self.is_star,
+            self.forces,
+            self.gravitational_constant,
+            CULL_DISTANCE_AU,
+        )
 
-        xs = [float(body.position[0]) for body in non_stars]
-        ys = [float(body.position[1]) for body in non_stars]
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
-        padding = CULL_DISTANCE_AU
-        if min_x == max_x:
-            min_x -= padding
-            max_x += padding
-        if min_y == max_y:
-            min_y -= padding
-            max_y += padding
-        qt_bounds = (min_x - padding, min_y - padding, max_x + padding, max_y + padding)
-        quadtree = QuadTree(qt_bounds, capacity=8, track_objects=True)
-
-        for body in non_stars:
-            try:
-                quadtree.insert((float(body.position[0]), float(body.position[1])), obj=body)
-            except ValueError as e:
-                # Planet is OOB
-                pass
-
-        # Query neighbors within 1 AU using bounding boxes, then precise distance filter.
-        for idx, body in enumerate(non_stars):
-            x = float(body.position[0])
-            y = float(body.position[1])
-            query_rect = (
-                x - CULL_DISTANCE_AU,
-                y - CULL_DISTANCE_AU,
-                x + CULL_DISTANCE_AU,
-                y + CULL_DISTANCE_AU,
+    def step(self, dt: float) -> None:
+        """
+        Advance every body by dt seconds. For direct-summation systems the
+        force accumulation and integration are fused into a single kernel
+        pass; the Barnes-Hut path computes forces first, then integrates.
+        """
+        if not self.bodies:
+            return
+        if np.any(self.masses == 0):
+            raise ZeroDivisionError("Cannot integrate body with zero mass.")
+        if self._accel_buf.shape != self.forces.shape:
+            self._accel_buf = np.empty_like(self.forces)
+
+        if len(self.bodies) < BARNES_HUT_MIN_BODIES:
+            # Snapshot positions into the scratch buffer so the fused kernel
+            # reads a consistent state while writing the new one.
+            np.copyto(self._accel_buf, self.positions)
+            step_bodies(
+                self._accel_buf,
+                self.positions,
+                self.velocities,
+                self.masses,
+                self.is_star,
+                self.forces,
+                self.gravitational_constant,
+                CULL_DISTANCE_AU,
+                dt,
             )
-            candidates = quadtree.query(query_rect, as_items=True)
-            for candidate_item in candidates:
-                if candidate_item.id_ <= idx:
-                    continue  # ensure each pair once
-                dx = float(candidate_item.x) - x
-                dy = float(candidate_item.y) - y
-                distance = math.hypot(dx, dy)
-                if distance > CULL_DISTANCE_AU or distance == 0:
-                    continue
-                other = non_stars[candidate_item.id_]
-                apply_force_pair(body, other)
+            return
 
-    def step(self, dt: float) -> None:
+        self._compute_gravity()
+        # Integrate without per-step temporaries: reuse the scratch buffer
+        # for both the acceleration and displacement products.
+        np.divide(self.forces, self.masses[:, None], out=self._accel_buf)
+        self._accel_buf *= dt
+        self.velocities += self._accel_buf
+        np.multiply(self.velocities, dt, out=self._accel_buf)
+        self.positions += self._accel_buf
+
+    def step_verlet(self, dt: float) -> None:
         """
-        Compute forces, then advance each body by dt seconds.
+        Advance every body with one velocity-Verlet step. Symplectic and
+        second-order, so it holds orbital energy at step sizes several
+        times coarser than the semi-implicit ``step``; callers trading
+        accuracy for speed can raise dt accordingly. The end-of-step
+        acceleration is carried over, so steady stepping costs one force
+        evaluation per call just like ``step``.
         """
         if not self.bodies:
             return
+        if np.any(self.masses == 0):
+            raise ZeroDivisionError("Cannot integrate body with zero mass.")
+        if self._verlet_accel is None or self._verlet_accel.shape != self.forces.shape:
+            self._compute_gravity()
+            self._verlet_accel = self.forces / self.masses[:, None]
+
+        accel = self._verlet_accel
+        self.positions += (self.velocities + 0.5 * dt * accel) * dt
         self._compute_gravity()
-        for body in self.bodies:
-            body.integrate(dt)
+        new_accel = self.forces / self.masses[:, None]
+        self.velocities += 0.5 * dt * (accel + new_accel)
+        self._verlet_accel = new_accel
 
     def sample_positions(
         self,
         duration_seconds: float = 300.0,
         sample_rate_hz: float = 10.0,
-    ) -> List[dict]:
+        dt_sec: Optional[float] = None,
+    ) -> Dict[str, np.ndarray]:
         """
-        Return a list of samples representing each body's position during the
-        requested duration. Duration defaults to 5 minutes sampled at 10 Hz.
+        Sample every body's position over the requested duration. Duration
+        defaults to 5 minutes sampled at 10 Hz. Returns a columnar dict
+        with ``t`` of shape (T,) and ``positions`` of shape (T, N, 3),
+        where row 0 is the initial state; body columns follow
+        ``self.bodies`` order. The step loop writes straight into the
+        preallocated buffer, so no per-sample Python objects are built.
+        Callers that already hold an exact step size can pass ``dt_sec``
+        directly instead of round-tripping it through a rate, which keeps
+        the time grid identical to the Kepler fast path's.
         """
-        if sample_rate_hz <= 0:
-            raise ValueError("sample_rate_hz must be positive")
+        if dt_sec is not None:
+            if dt_sec <= 0:
+                raise ValueError("dt_sec must be positive")
+            dt = dt_sec
+            steps = max(1, math.ceil(duration_seconds / dt))
+        else:
+            if sample_rate_hz <= 0:
+                raise ValueError("sample_rate_hz must be positive")
+            dt = 1.0 / sample_rate_hz
+            steps = max(1, math.ceil(duration_seconds * sample_rate_hz))
         if duration_seconds <= 0:
             raise ValueError("duration_seconds must be positive")
         if not self.bodies:
-            return []
-
-        dt = 1.0 / sample_rate_hz
-        steps = max(1, math.ceil(duration_seconds * sample_rate_hz))
+            return {"t": np.zeros(0), "positions": np.zeros((0, 0, 3))}
 
         # Preserve state so sampling does not mutate the live system.
-        preserved_state = [
-            (body, body.position.copy(), body.velocity.copy()) for body in self.bodies
-        ]
-
-        def capture_sample(t: float) -> dict:
-            bodies = []
-            for body in self.bodies:
-                bodies.append(
-                    {
-                        "name": body.name,
-                        "position": body.position.copy().tolist(),
-                        "metadata": dict(body.metadata),
-                    }
-                )
-            return {"t": t, "bodies": bodies}
+        preserved_positions = self.positions.copy()
+        preserved_velocities = self.velocities.copy()
 
-        samples: List[dict] = [capture_sample(0.0)]
+        positions = np.empty((steps + 1, len(self.bodies), 3))
+        positions[0] = self.positions
         try:
             for idx in range(1, steps + 1):
                 self.step(dt)
-                samples.append(capture_sample(idx * dt))
+                positions[idx] = self.positions
         finally:
-            for body, position, velocity in preserved_state:
-                body.position = position
-                body.velocity = velocity
-                body.reset_force()
-        return samples
+            self.positions[:] = preserved_positions
+            self.velocities[:] = preserved_velocities
+            self.forces.fill(0.0)
+        return {"t": np.arange(steps + 1) * dt, "positions": positions}
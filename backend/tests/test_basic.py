@@ -1,5 +1,6 @@
 from backend.physics import period_days
 from backend.music import a_to_midi
+from backend.music.note_mapping import radius_to_velocity
 import numpy as np
 
 def test_period_days_earth():
@@ -12,3 +13,10 @@ def test_a_to_midi_monotonic():
         midi = a_to_midi(a)
         assert midi >= last
         last = midi
+
+def test_radius_to_velocity_larger_is_louder():
+    last = radius_to_velocity(2.0)
+    for r in np.linspace(3.0, 12.0, 10):
+        vel = radius_to_velocity(r)
+        assert vel > last
+        last = vel
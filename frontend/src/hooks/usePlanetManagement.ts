@@ -1,5 +1,10 @@
 import { useState, useCallback, useEffect, useRef } from "react";
-import { BodyTemplate, CustomBodyConfig, ComputeResponse } from "../types";
+import {
+  BodyTemplate,
+  CustomBodyConfig,
+  ComputeWireResponse,
+  inflateWireSamples,
+} from "../types";
 import { computeMassFromConfig, getRandomPlanetVisuals, makeUniquePlanetName } from "../utils/planetHelpers";
 
 const API = "http://localhost:8000/api";
@@ -84,14 +89,14 @@ export const usePlanetManagement = (
 
         if (!res.ok) throw new Error(`Server responded with ${res.status}`);
 
-        const json: ComputeResponse = await res.json();
+        const json: ComputeWireResponse = await res.json();
         if (previewRequestRef.current !== requestId) return;
 
         const planetIdx = json.planetMetadata?.findIndex((p) => p.name === planet.name) ?? -1;
         const points =
           planetIdx >= 0
-            ? json.samples
-                ?.map((sample) => sample.positions?.[planetIdx])
+            ? inflateWireSamples(json.samples)
+                .map((sample) => sample.positions?.[planetIdx])
                 .filter((pos): pos is [number, number] => Array.isArray(pos))
                 .map((pos) => ({ x: pos[0], y: pos[1] }))
             : [];
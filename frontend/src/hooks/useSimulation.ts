@@ -1,5 +1,10 @@
 import { useState, useEffect, useRef, useCallback } from "react";
-import { SystemPreset, ComputeResponse } from "../types";
+import {
+  SystemPreset,
+  ComputeResponse,
+  ComputeWireResponse,
+  inflateWireSamples,
+} from "../types";
 import { stopAll } from "../audio";
 
 const API = "http://localhost:8000/api";
@@ -32,10 +37,10 @@ export const useSimulation = (): UseSimulationResult => {
 
       if (!res.ok) throw new Error(`Server responded with ${res.status}`);
 
-      const json: ComputeResponse = await res.json();
+      const json: ComputeWireResponse = await res.json();
       if (requestId !== computeRequestRef.current) return;
 
-      setData(json);
+      setData({ ...json, samples: inflateWireSamples(json.samples) });
     } catch (err: any) {
       console.error(err);
       if (requestId !== computeRequestRef.current) return;
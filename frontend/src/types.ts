@@ -50,6 +50,25 @@ export type TrajectorySample = {
   positions: [number, number][];
 };
 
+// Columnar wire format for samples: one t vector plus a (T, N, 2) position
+// tensor, which avoids repeating object keys for every sample.
+export type ColumnarSamples = {
+  t: number[];
+  positions: [number, number][][];
+};
+
+export type ComputeWireResponse = Omit<ComputeResponse, "samples"> & {
+  samples: ColumnarSamples;
+};
+
+export const inflateWireSamples = (
+  samples: ColumnarSamples | undefined
+): TrajectorySample[] =>
+  (samples?.t ?? []).map((t, idx) => ({
+    t,
+    positions: samples?.positions?.[idx] ?? [],
+  }));
+
 export type Event = {
   t: number;
   type: "note_on" | "note_off";
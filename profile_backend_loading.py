@@ -9,21 +9,45 @@ Run from repo root:
 
 from __future__ import annotations
 
+import argparse
 import csv
 import gzip
+import http.client
 import json
+import os
+import shutil
+import socket
 import subprocess
 import sys
+import threading
 import time
-import urllib.error
-import urllib.request
-from dataclasses import dataclass
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import astuple, dataclass
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - backend installs always have orjson
+    orjson = None
+
+
+def _json_dumps(obj: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Dict[str, object]:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 BACKEND_HOST = "127.0.0.1"
 BACKEND_PORT = 8000
-BASE_URL = f"http://{BACKEND_HOST}:{BACKEND_PORT}"
 APP_IMPORT_PATH = "backend.main:app"
 DEFAULT_DT = 0.05
 ITERATIONS_PER_SCENARIO = 6  # first = cold, remaining warm
@@ -59,39 +83,161 @@ CSV_FIELDS = [
     "dt_sec",
     "duration_sec",
     "planet_count",
+    # Hardware counters for the whole backend process, present only when
+    # PROFILE_PERF=1 wraps the server with `perf stat`.
+    "perf_cycles",
+    "perf_instructions",
+    "perf_cache_references",
+    "perf_cache_misses",
+    "perf_branch_misses",
 ]
 
+@dataclass(slots=True)
+class Row:
+    """One trace row; field order mirrors CSV_FIELDS."""
+
+    timestamp: str
+    scenario: str
+    iteration: int
+    run_kind: str
+    spawn_backend_process_ms: float
+    wait_for_server_ready_ms: float
+    post_compute_ms: float
+    decode_response_json_ms: float
+    server_samples_ms: Optional[float]
+    server_events_ms: Optional[float]
+    server_serialize_ms: Optional[float]
+    payload_bytes: int
+    payload_gzip_bytes: object  # int, or a Future until telemetry settles
+    dt_sec: float
+    duration_sec: float
+    planet_count: int
+    perf_cycles: Optional[int] = None
+    perf_instructions: Optional[int] = None
+    perf_cache_references: Optional[int] = None
+    perf_cache_misses: Optional[int] = None
+    perf_branch_misses: Optional[int] = None
+
+
+PERF_STATS_FILE = "perf_stats.csv"
+PERF_EVENTS = {
+    "cycles": "perf_cycles",
+    "instructions": "perf_instructions",
+    "cache-references": "perf_cache_references",
+    "cache-misses": "perf_cache_misses",
+    "branch-misses": "perf_branch_misses",
+}
+
+
+# Server and harness each get a dedicated core so they neither migrate nor
+# evict each other's caches, which tightens warm p95s run to run. Pinning
+# is skipped on small machines where dedicating cores would starve the OS.
+BACKEND_CPU = 2
+HARNESS_CPU = 3
+
+
+def _can_pin_cpus() -> bool:
+    return (os.cpu_count() or 0) > max(BACKEND_CPU, HARNESS_CPU)
+
+
+def _perf_enabled() -> bool:
+    return os.environ.get("PROFILE_PERF") == "1" and shutil.which("perf") is not None
+
+
+IMPORTTIME_LOG = "importtime.log"
+
+
+def _importtime_enabled() -> bool:
+    return os.environ.get("PROFILE_IMPORTTIME") == "1"
+
+
+def _report_import_times(path: str = IMPORTTIME_LOG, top: int = 10) -> None:
+    """Print the slowest backend imports from a -X importtime stderr log."""
+    entries = []
+    try:
+        with open(path) as f:
+            for line in f:
+                if not line.startswith("import time:"):
+                    continue
+                parts = line[len("import time:"):].split("|")
+                self_us = parts[0].strip()
+                if len(parts) == 3 and self_us.isdigit():
+                    entries.append((int(self_us), parts[2].strip()))
+    except OSError:
+        return
+    entries.sort(reverse=True)
+    print(f"\nSlowest backend imports (self time, {path}):")
+    for self_us, module in entries[:top]:
+        print(f"- {module}: {self_us / 1000.0:.1f} ms")
+
+
+def _parse_perf_stats(path: str = PERF_STATS_FILE) -> Dict[str, int]:
+    """Read the counters of interest out of perf's -x, CSV output."""
+    counters: Dict[str, int] = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.strip().split(",")
+                if len(parts) < 3 or line.startswith("#"):
+                    continue
+                column = PERF_EVENTS.get(parts[2].partition(":")[0])
+                if column is not None and parts[0].isdigit():
+                    counters[column] = int(parts[0])
+    except OSError:
+        pass
+    return counters
+
 
 def _ms(start: float) -> float:
     return (time.perf_counter() - start) * 1000.0
 
 
-def _percentile(values: List[float], pct: float) -> float:
-    if not values:
-        return 0.0
-    values_sorted = sorted(values)
-    k = (len(values_sorted) - 1) * pct / 100.0
-    lower = int(k)
-    upper = min(lower + 1, len(values_sorted) - 1)
-    if lower == upper:
-        return values_sorted[lower]
-    fraction = k - lower
-    return values_sorted[lower] + (values_sorted[upper] - values_sorted[lower]) * fraction
+# Off-loop telemetry work (compressed-size fallback) runs on one worker
+# thread so it never sits between two timed iterations.
+_telemetry_pool = ThreadPoolExecutor(max_workers=1)
+
+
+def _compressed_size(body: bytes) -> int:
+    # Level 1 is several times faster than the default and close enough
+    # for a compressed-size column.
+    return len(zlib.compress(body, 1))
+
+
+# One keep-alive connection per thread, reused across iterations so warm
+# timings measure server work, not repeated TCP/HTTP handshakes. Thread-
+# local storage lets concurrent mode run each worker on its own socket.
+_conn_local = threading.local()
+
+
+def _connection() -> http.client.HTTPConnection:
+    conn = getattr(_conn_local, "conn", None)
+    if conn is None:
+        conn = http.client.HTTPConnection(BACKEND_HOST, BACKEND_PORT, timeout=300)
+        _conn_local.conn = conn
+    return conn
+
+
+def _close_connection() -> None:
+    conn = getattr(_conn_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _conn_local.conn = None
 
 
 def _planet_payload(count: int, duration_sec: float, dt_sec: float) -> Dict[str, object]:
-    planets: List[Dict[str, object]] = []
-    for idx in range(count):
-        planets.append(
-            {
-                "name": f"Planet-{idx + 1}",
-                "kind": "gas" if idx >= count // 2 else "rocky",
-                "aAU": 0.35 + idx * 0.18,
-                "mass": 0.05 + idx * 0.08,
-                "color": "#88c0d0" if idx % 2 == 0 else "#e9967a",
-                "radius": 3.0 + idx * 0.4,
-            }
-        )
+    mid = count // 2
+    colors = ("#88c0d0", "#e9967a")
+    planets: List[Dict[str, object]] = [
+        {
+            "name": f"Planet-{idx + 1}",
+            "kind": "gas" if idx >= mid else "rocky",
+            "aAU": 0.35 + idx * 0.18,
+            "mass": 0.05 + idx * 0.08,
+            "color": colors[idx & 1],
+            "radius": 3.0 + idx * 0.4,
+        }
+        for idx in range(count)
+    ]
 
     return {
         "star": {"massMs": 1.0},
@@ -105,8 +251,12 @@ def _planet_payload(count: int, duration_sec: float, dt_sec: float) -> Dict[str,
 
 
 def start_backend() -> subprocess.Popen:
+    # -OO drops docstrings and asserts from the imported bytecode, which
+    # shrinks the cold-start import working set; nothing in the backend
+    # relies on either at runtime.
     cmd = [
         sys.executable,
+        "-OO",
         "-m",
         "uvicorn",
         APP_IMPORT_PATH,
@@ -115,91 +265,173 @@ def start_backend() -> subprocess.Popen:
         "--port",
         str(BACKEND_PORT),
     ]
-    return subprocess.Popen(cmd)
-
-
-def wait_for_backend(
-    backend_proc: subprocess.Popen, timeout_sec: float = 20.0, poll_interval: float = 0.25
-) -> float:
-    """Return time (ms) spent waiting for the backend to answer."""
-    url = f"{BASE_URL}/openapi.json"
+    stderr_log = None
+    if _importtime_enabled():
+        # Per-module import timings land on stderr; captured to a log so
+        # the slowest imports can be reported after the run.
+        cmd[1:1] = ["-X", "importtime"]
+        stderr_log = open(IMPORTTIME_LOG, "w")
+    if _perf_enabled():
+        # PMU sampling of the whole server process: counters land in
+        # PERF_STATS_FILE on exit and are merged into the trace rows.
+        cmd = ["perf", "stat", "-dd", "-x,", "-o", PERF_STATS_FILE] + cmd
+    if _can_pin_cpus() and shutil.which("taskset"):
+        cmd = ["taskset", "-c", str(BACKEND_CPU)] + cmd
+    # A fixed hash seed keeps dict iteration order (and therefore JSON key
+    # order and allocation patterns) identical across runs.
+    env = {**os.environ, "PYTHONHASHSEED": "0"}
+    proc = subprocess.Popen(cmd, env=env, stderr=stderr_log)
+    if stderr_log is not None:
+        stderr_log.close()  # The child holds its own copy of the handle
+    return proc
+
+
+def wait_for_backend(backend_proc: subprocess.Popen, timeout_sec: float = 20.0) -> float:
+    """
+    Return time (ms) spent waiting for the backend to accept connections.
+    A raw TCP probe detects readiness without forcing the server through
+    its slowest cold path (OpenAPI schema generation); whatever app init
+    remains lands in the first compute iteration, where the cold row
+    already accounts for it.
+    """
     start = time.perf_counter()
+    # Start probing almost immediately and back off geometrically: a fixed
+    # 250 ms poll quantized wait_for_server_ready_ms to the next bucket even
+    # when the server came up in tens of milliseconds.
+    poll_interval = 0.005
 
     while time.perf_counter() - start < timeout_sec:
         if backend_proc.poll() is not None:
             raise RuntimeError(
                 f"Backend process exited early with code {backend_proc.returncode}"
             )
+        probe = socket.socket()
+        probe.settimeout(0.1)
         try:
-            with urllib.request.urlopen(url, timeout=2) as resp:
-                if resp.status == 200:
-                    return _ms(start)
-        except (urllib.error.URLError, ConnectionRefusedError):
-            time.sleep(poll_interval)
-            continue
+            ready = probe.connect_ex((BACKEND_HOST, BACKEND_PORT)) == 0
+        finally:
+            probe.close()
+        if ready:
+            return _ms(start)
+        time.sleep(poll_interval)
+        poll_interval = min(poll_interval * 1.5, 0.1)
     raise RuntimeError("Backend did not become ready in time")
 
 
-def post_compute(payload: Dict[str, object]) -> Dict[str, object]:
-    """Return detailed timings and sizes for one /api/compute call."""
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        f"{BASE_URL}/api/compute",
-        data=data,
-        headers={"Content-Type": "application/json"},
-    )
+def post_compute(data: bytes) -> Dict[str, object]:
+    """
+    Return detailed timings and sizes for one /api/compute call. ``data``
+    is the already-encoded request body; iterations reuse the same bytes
+    instead of re-serializing an identical payload each time.
+    """
+    conn = _connection()
 
     start = time.perf_counter()
-    with urllib.request.urlopen(req, timeout=300) as resp:
+    try:
+        conn.request(
+            "POST",
+            "/api/compute",
+            body=data,
+            headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"},
+        )
+        resp = conn.getresponse()
         body = resp.read()
+        response_headers = resp.headers
+    except (http.client.HTTPException, OSError):
+        # A dropped keep-alive connection is unusable; reset so the next
+        # call reconnects cleanly.
+        _close_connection()
+        raise
     request_ms = _ms(start)
+    if response_headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
 
     decode_start = time.perf_counter()
-    decoded = json.loads(body)
+    decoded = _json_loads(body)
     decode_ms = _ms(decode_start)
 
     profile_meta = decoded.get("meta", {}).get("profile", {})
     server_timings = profile_meta.get("timingsMs", {})
-    payload_gzip_bytes = profile_meta.get("payloadGzipBytes")
-    if payload_gzip_bytes is None:
-        payload_gzip_bytes = len(gzip.compress(body))
+
+    # Serialization-dependent metrics arrive as headers (the server writes
+    # them after serializing the body exactly once).
+    serialize_ms = response_headers.get("X-Serialize-Ms")
+    if serialize_ms is None:
+        serialize_ms = server_timings.get("serialize_response_json")
+    else:
+        serialize_ms = float(serialize_ms)
+    payload_bytes = response_headers.get("X-Payload-Bytes")
+    payload_bytes = int(payload_bytes) if payload_bytes is not None else len(body)
+    payload_gzip_bytes = response_headers.get("X-Payload-Gzip-Bytes")
+    if payload_gzip_bytes is not None:
+        payload_gzip_bytes = int(payload_gzip_bytes)
+    else:
+        # Size-estimate fallback only. Hand the compression to the telemetry
+        # worker so it never delays the next iteration's submission; the
+        # future is resolved after the scenario's iterations finish.
+        payload_gzip_bytes = _telemetry_pool.submit(_compressed_size, body)
     return {
         "post_compute_ms": request_ms,
         "decode_response_json_ms": decode_ms,
         "server_samples_ms": server_timings.get("samples_for_system"),
         "server_events_ms": server_timings.get("events_for_system"),
-        "server_serialize_ms": server_timings.get("serialize_response_json"),
-        "payload_bytes": profile_meta.get("payloadBytes", len(body)),
+        "server_serialize_ms": serialize_ms,
+        "payload_bytes": payload_bytes,
         "payload_gzip_bytes": payload_gzip_bytes,
     }
 
 
-def _write_trace(rows: List[Dict[str, object]]) -> None:
-    with open("profiling_runs.csv", "a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+def _write_trace(rows: List[Row]) -> None:
+    # Plain csv.writer over the slotted rows' value tuples skips
+    # DictWriter's per-row fieldname shuffle, and the large buffer plus one
+    # writerows call flushes the whole batch with a single write.
+    with open("profiling_runs.csv", "a", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
         if f.tell() == 0:
-            writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
+            writer.writerow(CSV_FIELDS)
+        writer.writerows(astuple(row) for row in rows)
 
 
 def _summary_line(values: List[float]) -> str:
     if not values:
         return "min=0.0 p50=0.0 p95=0.0 max=0.0"
+    # One vectorized pass yields all four statistics; np.quantile's default
+    # linear interpolation matches the percentile formula used before.
+    qs = np.quantile(np.asarray(values, dtype=np.float64), [0.0, 0.5, 0.95, 1.0])
     return (
-        f"min={min(values):.1f} ms "
-        f"p50={_percentile(values, 50):.1f} ms "
-        f"p95={_percentile(values, 95):.1f} ms "
-        f"max={max(values):.1f} ms"
+        f"min={qs[0]:.1f} ms "
+        f"p50={qs[1]:.1f} ms "
+        f"p95={qs[2]:.1f} ms "
+        f"max={qs[3]:.1f} ms"
     )
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Sample the measurement loop with pyinstrument and write profile.html",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Dispatch each scenario's iterations across N worker threads; "
+        "rows are marked run_kind=concurrent since in-flight requests "
+        "contend on the server and are not comparable to serial latency",
+    )
+    args = parser.parse_args()
+
+    if _can_pin_cpus() and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {HARNESS_CPU})
+
     run_timestamp = datetime.now(timezone.utc).isoformat()
     backend_proc: Optional[subprocess.Popen] = None
     spawn_ms = 0.0
     ready_ms = 0.0
-    all_rows: List[Dict[str, object]] = []
+    all_rows: List[Row] = []
 
     try:
         spawn_start = time.perf_counter()
@@ -208,67 +440,111 @@ def main() -> None:
 
         ready_ms = wait_for_backend(backend_proc)
 
+        profiler = None
+        if args.profile:
+            # Statistical sampling attributes time across the client, HTTP,
+            # and decode paths at a few percent overhead, without wrapping
+            # yet more perf_counter calls around each block.
+            from pyinstrument import Profiler
+
+            profiler = Profiler(interval=0.001)
+            profiler.start()
+
         for scenario in SCENARIOS:
             payload = _planet_payload(
                 scenario.planet_count, scenario.duration_sec, DEFAULT_DT
             )
-            scenario_rows: List[Dict[str, object]] = []
+            request_body = _json_dumps(payload)
+            scenario_rows: List[Row] = []
+
+            if args.concurrency > 1:
+                # Worker threads each keep their own connection; shutting the
+                # pool down afterwards releases those sockets.
+                with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                    compute_results = list(
+                        pool.map(
+                            post_compute, [request_body] * ITERATIONS_PER_SCENARIO
+                        )
+                    )
+            else:
+                compute_results = [
+                    post_compute(request_body)
+                    for _ in range(ITERATIONS_PER_SCENARIO)
+                ]
 
-            for iteration in range(ITERATIONS_PER_SCENARIO):
-                compute_result = post_compute(payload)
+            for iteration, compute_result in enumerate(compute_results):
                 is_first_request = len(all_rows) == 0
-                row = {
-                    "timestamp": run_timestamp,
-                    "scenario": scenario.name,
-                    "iteration": iteration,
-                    "run_kind": "cold" if is_first_request else "warm",
-                    "spawn_backend_process_ms": spawn_ms if is_first_request else 0.0,
-                    "wait_for_server_ready_ms": ready_ms if is_first_request else 0.0,
-                    "post_compute_ms": compute_result["post_compute_ms"],
-                    "decode_response_json_ms": compute_result["decode_response_json_ms"],
-                    "server_samples_ms": compute_result["server_samples_ms"],
-                    "server_events_ms": compute_result["server_events_ms"],
-                    "server_serialize_ms": compute_result["server_serialize_ms"],
-                    "payload_bytes": compute_result["payload_bytes"],
-                    "payload_gzip_bytes": compute_result["payload_gzip_bytes"],
-                    "dt_sec": DEFAULT_DT,
-                    "duration_sec": scenario.duration_sec,
-                    "planet_count": scenario.planet_count,
-                }
+                if args.concurrency > 1:
+                    run_kind = "concurrent"
+                else:
+                    run_kind = "cold" if is_first_request else "warm"
+                row = Row(
+                    timestamp=run_timestamp,
+                    scenario=scenario.name,
+                    iteration=iteration,
+                    run_kind=run_kind,
+                    spawn_backend_process_ms=spawn_ms if is_first_request else 0.0,
+                    wait_for_server_ready_ms=ready_ms if is_first_request else 0.0,
+                    post_compute_ms=compute_result["post_compute_ms"],
+                    decode_response_json_ms=compute_result["decode_response_json_ms"],
+                    server_samples_ms=compute_result["server_samples_ms"],
+                    server_events_ms=compute_result["server_events_ms"],
+                    server_serialize_ms=compute_result["server_serialize_ms"],
+                    payload_bytes=compute_result["payload_bytes"],
+                    payload_gzip_bytes=compute_result["payload_gzip_bytes"],
+                    dt_sec=DEFAULT_DT,
+                    duration_sec=scenario.duration_sec,
+                    planet_count=scenario.planet_count,
+                )
                 scenario_rows.append(row)
                 all_rows.append(row)
 
+            # All timed iterations for this scenario are done; settle any
+            # deferred telemetry before summarizing.
+            for row in scenario_rows:
+                if isinstance(row.payload_gzip_bytes, Future):
+                    row.payload_gzip_bytes = row.payload_gzip_bytes.result()
+
             print(f"\nScenario: {scenario.name} ({scenario.planet_count} planets, "
                   f"{scenario.duration_sec}s, dt={DEFAULT_DT})")
-            cold = [r for r in scenario_rows if r["run_kind"] == "cold"]
-            warm = [r for r in scenario_rows if r["run_kind"] == "warm"]
-
-            for label, runs in [("Cold start", cold), ("Warm", warm)]:
+            # The partition is known by construction: serially, only the
+            # very first iteration of the first scenario is cold.
+            if args.concurrency > 1:
+                cold, warm, concurrent = [], [], scenario_rows
+            elif scenario is SCENARIOS[0]:
+                cold, warm, concurrent = scenario_rows[:1], scenario_rows[1:], []
+            else:
+                cold, warm, concurrent = [], scenario_rows, []
+
+            for label, runs in [
+                ("Cold start", cold),
+                ("Warm", warm),
+                ("Concurrent", concurrent),
+            ]:
                 if not runs:
                     continue
-                req_times = [r["post_compute_ms"] for r in runs]
-                decode_times = [r["decode_response_json_ms"] for r in runs]
-                physics = [
-                    r["server_samples_ms"]
-                    for r in runs
-                    if r["server_samples_ms"] is not None
-                ]
-                music = [
-                    r["server_events_ms"]
-                    for r in runs
-                    if r["server_events_ms"] is not None
-                ]
-                serialize = [
-                    r["server_serialize_ms"]
-                    for r in runs
-                    if r["server_serialize_ms"] is not None
-                ]
-                sizes = [r["payload_bytes"] for r in runs if r["payload_bytes"] is not None]
-                gzip_sizes = [
-                    r["payload_gzip_bytes"]
-                    for r in runs
-                    if r["payload_gzip_bytes"] is not None
-                ]
+                # One traversal gathers every metric; the None filters for
+                # the optional server-side columns are folded in.
+                req_times: List[float] = []
+                decode_times: List[float] = []
+                physics: List[float] = []
+                music: List[float] = []
+                serialize: List[float] = []
+                sizes: List[int] = []
+                gzip_sizes: List[int] = []
+                for r in runs:
+                    req_times.append(r.post_compute_ms)
+                    decode_times.append(r.decode_response_json_ms)
+                    if r.server_samples_ms is not None:
+                        physics.append(r.server_samples_ms)
+                    if r.server_events_ms is not None:
+                        music.append(r.server_events_ms)
+                    if r.server_serialize_ms is not None:
+                        serialize.append(r.server_serialize_ms)
+                    if r.payload_bytes is not None:
+                        sizes.append(r.payload_bytes)
+                    if r.payload_gzip_bytes is not None:
+                        gzip_sizes.append(r.payload_gzip_bytes)
 
                 print(f"- {label} request: {_summary_line(req_times)}")
                 print(f"- {label} decode: {_summary_line(decode_times)}")
@@ -282,8 +558,12 @@ def main() -> None:
                         f"gzip_avg={(sum(gzip_sizes)/len(gzip_sizes)) if gzip_sizes else 0:.0f}B"
                     )
 
-        _write_trace(all_rows)
+        if profiler is not None:
+            profiler.stop()
+            profiler.write_html("profile.html")
+            print("\nSampling profile written to profile.html")
     finally:
+        _close_connection()
         if backend_proc is not None:
             backend_proc.terminate()
             try:
@@ -291,6 +571,17 @@ def main() -> None:
             except subprocess.TimeoutExpired:
                 backend_proc.kill()
 
+    # perf only writes its counter file once the server exits, so the trace
+    # is written after shutdown with whatever counters were collected.
+    if _perf_enabled():
+        perf_counters = _parse_perf_stats()
+        for row in all_rows:
+            for column, value in perf_counters.items():
+                setattr(row, column, value)
+    if _importtime_enabled():
+        _report_import_times()
+    _write_trace(all_rows)
+
     print("\nPer-run traces appended to profiling_runs.csv")
 
 